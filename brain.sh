@@ -31,6 +31,10 @@ start() {
         sleep 2
     fi
 
+    # Precompile bytecode so server and MCP cold starts skip compilation
+    # (-l: top-level modules only, not the venv)
+    "$VENV_PYTHON" -m compileall -q -l "$SCRIPT_DIR" > /dev/null 2>&1
+
     # Start server in background
     cd "$SCRIPT_DIR"
     nohup "$VENV_PYTHON" "$SERVER_SCRIPT" >> "$LOG_FILE" 2>&1 &
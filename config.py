@@ -2,12 +2,16 @@
 Shared configuration for Local Memory Bridge.
 Hybrid setup: OpenRouter (cloud LLM) + Ollama (local embeddings) + Chroma (local storage)
 """
+import functools
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv(Path(__file__).parent / ".env")
+# Load environment variables once; child processes inherit the parsed values
+if not os.environ.get("LOCAL_MEMORY_ENV_LOADED"):
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).parent / ".env")
+    os.environ["LOCAL_MEMORY_ENV_LOADED"] = "1"
 
 # Paths
 PROJECT_DIR = Path(__file__).parent
@@ -25,39 +29,54 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 LLM_MODEL = os.getenv("LLM_MODEL", "google/gemini-2.0-flash-exp:free")
 USER_ID = os.getenv("USER_ID", "marc_wu")
 
+# Local embeddings (Ollama)
+OLLAMA_BASE_URL = "http://localhost:11434"
+EMBED_MODEL = "nomic-embed-text"
+# Texts per /api/embed request: ~32 suits CPU/Apple MPS, ~128 a CUDA GPU
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+
 
 # Mem0 configuration (Hybrid: Cloud LLM + Local Embeddings + Chroma)
-MEM0_CONFIG = {
-    "llm": {
-        "provider": "openai",
-        "config": {
-            "model": LLM_MODEL,
-            "api_key": OPENROUTER_API_KEY,
-            "openai_base_url": "https://openrouter.ai/api/v1",
-            "temperature": 0.1,
-            "max_tokens": 2000
-        }
-    },
-    "embedder": {
-        "provider": "ollama",
-        "config": {
-            "model": "nomic-embed-text",
-            "ollama_base_url": "http://localhost:11434"
-        }
-    },
-    "vector_store": {
-        "provider": "chroma",
-        "config": {
-            "collection_name": "local_memory",
-            "path": str(CHROMA_PATH)
-        }
-    },
-    "history_db_path": str(HISTORY_DB_PATH)
-}
+@functools.lru_cache(maxsize=1)
+def mem0_config() -> dict:
+    """Build the mem0 config on first use (only the server and CLI need it)."""
+    return {
+        "llm": {
+            "provider": "openai",
+            "config": {
+                "model": LLM_MODEL,
+                "api_key": OPENROUTER_API_KEY,
+                "openai_base_url": "https://openrouter.ai/api/v1",
+                "temperature": 0.1,
+                "max_tokens": 2000
+            }
+        },
+        "embedder": {
+            "provider": "ollama",
+            "config": {
+                "model": EMBED_MODEL,
+                "ollama_base_url": OLLAMA_BASE_URL
+            }
+        },
+        "vector_store": {
+            "provider": "chroma",
+            "config": {
+                "collection_name": "local_memory",
+                "path": str(CHROMA_PATH)
+            }
+        },
+        "history_db_path": str(HISTORY_DB_PATH)
+    }
+
 
 # Server settings
 SERVER_HOST = "0.0.0.0"
 SERVER_PORT = 8000
+# Each worker is a separate process with its own Memory/Chroma client and caches;
+# keep 1 unless Chroma runs in server mode
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+# LLM-free /direct/* endpoints (the MCP server's emotional tools rely on them)
+DIRECT_ENDPOINTS = os.getenv("LOCAL_MEMORY_DIRECT", "1") == "1"
 
 # Project Category Schemas for memory organization
 # Format: project -> category -> {description, ttl_days (None = never expires)}
@@ -152,5 +171,15 @@ PROJECT_CATEGORIES = {
     }
 }
 
+# Flat (project, category) -> ttl_days index for O(1) lookups and validation
+CATEGORY_TTL = {
+    (project, category): schema["ttl_days"]
+    for project, categories in PROJECT_CATEGORIES.items()
+    for category, schema in categories.items()
+}
+
 # Default TTL for time-sensitive memories (days)
 DEFAULT_TTL_DAYS = 30
+
+# Minutes between background deletes of expired memories (0 = only via /prune)
+PRUNE_INTERVAL_MINUTES = float(os.getenv("PRUNE_INTERVAL_MINUTES", "60"))
@@ -6,27 +6,87 @@ Integrates with Claude Desktop via Model Context Protocol.
 This server exposes memory tools that Claude can use to:
 - Save important information to persistent local memory
 - Search through past memories and preferences
+- Look up emotional patterns (disable with LOCAL_MEMORY_EMOTIONAL=0)
 """
-import requests
+import functools
+import os
+import time
+from itertools import islice
+
+import httpx
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from orjson import dumps as _dumps
+    from orjson import loads as _loads
+except ImportError:  # orjson is optional; stdlib json handles the same payloads
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 # Create MCP server
 mcp = FastMCP("Local Memory Brain")
 
 # API endpoint (our FastAPI server)
 API_URL = "http://localhost:8000"
 
+# Emotional pattern tools are registered only when enabled
+ENABLE_EMOTIONAL_TOOLS = os.getenv("LOCAL_MEMORY_EMOTIONAL", "1") == "1"
+
+# Shared client so tool calls reuse a keep-alive connection to the API.
+# httpx is already loaded by the MCP SDK, so this adds no import cost.
+CLIENT = httpx.Client(base_url=API_URL, timeout=10.0, limits=httpx.Limits(max_connections=4))
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+SERVER_DOWN_MESSAGE = "Error: Local Memory server is not running. Please run 'brain start' in terminal."
+
+# Formatted memory_stats output is reused for calls within this window
+STATS_TTL_SECONDS = 1.0
+_stats_cache = {"ts": 0.0, "text": None}
+
 
 def check_api():
-    """Check if the API server is running."""
+    """Check if the API server is running (status helper; tools detect a down server themselves)."""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=2)
+        response = CLIENT.get("/health", timeout=2)
         return response.status_code == 200
-    except:
+    except httpx.HTTPError:
         return False
 
 
+def _memory_text(mem: dict) -> str:
+    """Text of an API result item."""
+    return mem.get("memory", "No content")
+
+
+def _category(mem: dict, default: str = "general") -> str:
+    """Category of an API result item."""
+    return mem.get("metadata", {}).get("category", default)
+
+
+def _truncate(text: str, length: int) -> str:
+    """Shorten text to `length` characters, marking the cut with '...'."""
+    return text[:length] + "..." if len(text) > length else text
+
+
+def api_tool(fn):
+    """Turn API failures inside a tool into the message returned to Claude."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            return SERVER_DOWN_MESSAGE
+        except Exception as e:
+            return f"Error: {e}"
+    return wrapper
+
+
 @mcp.tool()
+@api_tool
 def save_memory(content: str, category: str = "general") -> str:
     """
     Save important information, code snippets, preferences, or decisions to local persistent memory.
@@ -51,36 +111,30 @@ def save_memory(content: str, category: str = "general") -> str:
     Returns:
         Success or error message.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
-
     # Parse category format (project:type or just type)
-    if ":" in category:
-        project, cat_type = category.split(":", 1)
+    project, sep, cat_type = category.partition(":")
+    if not sep:
+        project, cat_type = "general", category
+
+    response = CLIENT.post(
+        "/add",
+        content=_dumps({
+            "text": content,
+            "category": cat_type,
+            "project": project,
+            "source": "claude_code"
+        }),
+        headers=JSON_HEADERS,
+        timeout=30
+    )
+    if response.status_code == 200:
+        return f"Memory saved [{project}:{cat_type}]: {content[:50]}..."
     else:
-        project = "general"
-        cat_type = category
-
-    try:
-        response = requests.post(
-            f"{API_URL}/add",
-            json={
-                "text": content,
-                "category": cat_type,
-                "project": project,
-                "source": "claude_code"
-            },
-            timeout=30
-        )
-        if response.status_code == 200:
-            return f"Memory saved [{project}:{cat_type}]: {content[:50]}..."
-        else:
-            return f"Error saving memory: {response.text}"
-    except Exception as e:
-        return f"Error: {str(e)}"
+        return f"Error saving memory: {response.text}"
 
 
 @mcp.tool()
+@api_tool
 def search_memory(query: str, limit: int = 5) -> str:
     """
     Search through past memories, preferences, project details, and saved information.
@@ -98,39 +152,29 @@ def search_memory(query: str, limit: int = 5) -> str:
     Returns:
         Relevant memories or "No memories found" message.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
-
-    try:
-        response = requests.get(
-            f"{API_URL}/search",
-            params={"q": query, "limit": limit},
-            timeout=10
-        )
+    response = CLIENT.get(
+        "/search",
+        params={"q": query, "limit": limit},
+        timeout=10
+    )
 
-        if response.status_code != 200:
-            return f"Error searching: {response.text}"
+    if response.status_code != 200:
+        return f"Error searching: {response.text}"
 
-        data = response.json()
-        results = data.get("results", [])
+    data = _loads(response.content)
+    results = data.get("results", [])
 
-        if not results:
-            return "No memories found matching your query."
+    if not results:
+        return "No memories found matching your query."
 
-        output = f"Found {len(results)} relevant memories:\n\n"
-        for i, mem in enumerate(results, 1):
-            memory_text = mem.get("memory", "No content")
-            score = mem.get("score", 0)
-            category = mem.get("metadata", {}).get("category", "general")
-            output += f"{i}. [{category}] (relevance: {score:.2f})\n   {memory_text}\n\n"
-
-        return output
-
-    except Exception as e:
-        return f"Error: {str(e)}"
+    return f"Found {len(results)} relevant memories:\n\n" + "".join(
+        f"{i}. [{_category(mem)}] (relevance: {mem.get('score', 0):.2f})\n   {_memory_text(mem)}\n\n"
+        for i, mem in enumerate(results, 1)
+    )
 
 
 @mcp.tool()
+@api_tool
 def list_memories(limit: int = 10) -> str:
     """
     List recent memories stored in the local memory brain.
@@ -143,42 +187,30 @@ def list_memories(limit: int = 10) -> str:
     Returns:
         List of recent memories.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
+    response = CLIENT.get(
+        "/list",
+        params={"limit": limit},
+        timeout=10
+    )
 
-    try:
-        response = requests.get(
-            f"{API_URL}/list",
-            params={"limit": limit},
-            timeout=10
-        )
+    if response.status_code != 200:
+        return f"Error listing memories: {response.text}"
 
-        if response.status_code != 200:
-            return f"Error listing memories: {response.text}"
+    data = _loads(response.content)
+    results = data.get("results", [])
 
-        data = response.json()
-        results = data.get("results", [])
+    if not results:
+        return "No memories stored yet."
 
-        if not results:
-            return "No memories stored yet."
-
-        output = f"Showing {len(results)} memories:\n\n"
-        for i, mem in enumerate(results, 1):
-            memory_text = mem.get("memory", "No content")
-            category = mem.get("metadata", {}).get("category", "general")
-            mem_id = mem.get("id", "N/A")
-            # Truncate long memories
-            if len(memory_text) > 100:
-                memory_text = memory_text[:100] + "..."
-            output += f"{i}. [{category}] {memory_text}\n   ID: {mem_id}\n\n"
-
-        return output
-
-    except Exception as e:
-        return f"Error: {str(e)}"
+    # Long memories are truncated to 100 characters
+    return f"Showing {len(results)} memories:\n\n" + "".join(
+        f"{i}. [{_category(mem)}] {_truncate(_memory_text(mem), 100)}\n   ID: {mem.get('id', 'N/A')}\n\n"
+        for i, mem in enumerate(results, 1)
+    )
 
 
 @mcp.tool()
+@api_tool
 def get_project_context(project_name: str) -> str:
     """
     Get all memories and context related to a specific project.
@@ -191,33 +223,27 @@ def get_project_context(project_name: str) -> str:
     Returns:
         Relevant project context and past decisions.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
-
-    try:
-        response = requests.get(
-            f"{API_URL}/context",
-            params={"project": project_name, "limit": 10},
-            timeout=10
-        )
-
-        if response.status_code != 200:
-            return f"Error getting context: {response.text}"
+    response = CLIENT.get(
+        "/context",
+        params={"project": project_name, "limit": 10},
+        timeout=10
+    )
 
-        data = response.json()
-        context = data.get("context", "")
-        count = data.get("count", 0)
+    if response.status_code != 200:
+        return f"Error getting context: {response.text}"
 
-        if not context:
-            return f"No memories found for project: {project_name}"
+    data = _loads(response.content)
+    context = data.get("context", "")
+    count = data.get("count", 0)
 
-        return f"Context for {project_name} ({count} memories):\n\n{context}"
+    if not context:
+        return f"No memories found for project: {project_name}"
 
-    except Exception as e:
-        return f"Error: {str(e)}"
+    return f"Context for {project_name} ({count} memories):\n\n{context}"
 
 
 @mcp.tool()
+@api_tool
 def memory_stats() -> str:
     """
     Get statistics about stored memories.
@@ -227,34 +253,30 @@ def memory_stats() -> str:
     Returns:
         Memory statistics including total count and breakdown by category.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
+    now = time.monotonic()
+    if _stats_cache["text"] is not None and now - _stats_cache["ts"] < STATS_TTL_SECONDS:
+        return _stats_cache["text"]
 
-    try:
-        response = requests.get(f"{API_URL}/stats", timeout=10)
-
-        if response.status_code != 200:
-            return f"Error getting stats: {response.text}"
-
-        data = response.json()
-        total = data.get("total_memories", 0)
-        categories = data.get("by_category", {})
+    response = CLIENT.get("/stats", timeout=10)
 
-        output = f"Memory Statistics:\n"
-        output += f"Total memories: {total}\n\n"
-        output += "By category:\n"
-        for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
-            output += f"  - {cat}: {count}\n"
+    if response.status_code != 200:
+        return f"Error getting stats: {response.text}"
 
-        return output
+    data = _loads(response.content)
+    total = data.get("total_memories", 0)
+    categories = data.get("by_category", {})
 
-    except Exception as e:
-        return f"Error: {str(e)}"
+    text = f"Memory Statistics:\nTotal memories: {total}\n\nBy category:\n" + "".join(
+        f"  - {cat}: {count}\n" for cat, count in sorted(categories.items(), key=lambda x: -x[1])
+    )
+    _stats_cache["ts"] = now
+    _stats_cache["text"] = text
+    return text
 
 
 # ===== EMOTIONAL PATTERN TOOLS =====
 
-EMOTIONAL_CATEGORIES = [
+EMOTIONAL_CATEGORIES = frozenset([
     "emotional_pattern",
     "thinking_trap",
     "trigger",
@@ -262,10 +284,15 @@ EMOTIONAL_CATEGORIES = [
     "growth_insight",
     "core_value",
     "emotional",
-]
+])
+COPING_CATEGORIES = frozenset(["coping_strategy", "growth_insight"])
 
+# Comma-separated forms for the /direct/search `categories` filter
+EMOTIONAL_CATEGORIES_PARAM = ",".join(sorted(EMOTIONAL_CATEGORIES))
+COPING_CATEGORIES_PARAM = ",".join(sorted(COPING_CATEGORIES))
 
-@mcp.tool()
+
+@api_tool
 def search_emotional_patterns(query: str, limit: int = 5) -> str:
     """
     Search through emotional patterns, thinking traps, and psychological insights.
@@ -286,45 +313,35 @@ def search_emotional_patterns(query: str, limit: int = 5) -> str:
     Returns:
         Relevant emotional patterns, triggers, and insights.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
+    # Use direct endpoint (no LLM needed)
+    response = CLIENT.get(
+        "/direct/search",
+        params={"q": query, "limit": limit, "categories": EMOTIONAL_CATEGORIES_PARAM},
+        timeout=30
+    )
 
-    try:
-        # Use direct endpoint (no LLM needed)
-        response = requests.get(
-            f"{API_URL}/direct/search",
-            params={"q": query, "limit": limit * 2},
-            timeout=30
-        )
+    if response.status_code != 200:
+        return f"Error searching: {response.text}"
 
-        if response.status_code != 200:
-            return f"Error searching: {response.text}"
+    data = _loads(response.content)
+    results = data.get("results", [])
 
-        data = response.json()
-        results = data.get("results", [])
+    # Server filters by category; re-check in case of an older server
+    emotional_results = list(islice(
+        (r for r in results if r.get("metadata", {}).get("category") in EMOTIONAL_CATEGORIES),
+        limit
+    ))
 
-        # Filter to emotional categories
-        emotional_results = [
-            r for r in results
-            if r.get("metadata", {}).get("category", "") in EMOTIONAL_CATEGORIES
-        ][:limit]
+    if not emotional_results:
+        return "No emotional patterns found matching your query."
 
-        if not emotional_results:
-            return "No emotional patterns found matching your query."
+    return f"Found {len(emotional_results)} emotional patterns:\n\n" + "".join(
+        f"{i}. [{_category(mem, 'emotional')}]\n   {_memory_text(mem)}\n\n"
+        for i, mem in enumerate(emotional_results, 1)
+    )
 
-        output = f"Found {len(emotional_results)} emotional patterns:\n\n"
-        for i, mem in enumerate(emotional_results, 1):
-            memory_text = mem.get("memory", "No content")
-            category = mem.get("metadata", {}).get("category", "emotional")
-            output += f"{i}. [{category}]\n   {memory_text}\n\n"
 
-        return output
-
-    except Exception as e:
-        return f"Error: {str(e)}"
-
-
-@mcp.tool()
+@api_tool
 def get_coping_strategies(situation: str) -> str:
     """
     Retrieve coping strategies that have worked for specific emotions or situations.
@@ -341,44 +358,34 @@ def get_coping_strategies(situation: str) -> str:
     Returns:
         Coping strategies that have been effective in similar situations.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
-
-    try:
-        # Use direct endpoint (no LLM needed)
-        response = requests.get(
-            f"{API_URL}/direct/search",
-            params={"q": f"coping strategy {situation}", "limit": 10},
-            timeout=30
-        )
+    # Use direct endpoint (no LLM needed)
+    response = CLIENT.get(
+        "/direct/search",
+        params={"q": f"coping strategy {situation}", "limit": 5, "categories": COPING_CATEGORIES_PARAM},
+        timeout=30
+    )
 
-        if response.status_code != 200:
-            return f"Error searching: {response.text}"
+    if response.status_code != 200:
+        return f"Error searching: {response.text}"
 
-        data = response.json()
-        results = data.get("results", [])
+    data = _loads(response.content)
+    results = data.get("results", [])
 
-        # Filter to coping strategies and related
-        coping_results = [
-            r for r in results
-            if r.get("metadata", {}).get("category", "") in ["coping_strategy", "growth_insight"]
-        ][:5]
+    # Server filters by category; re-check in case of an older server
+    coping_results = list(islice(
+        (r for r in results if r.get("metadata", {}).get("category") in COPING_CATEGORIES),
+        5
+    ))
 
-        if not coping_results:
-            return f"No specific coping strategies found for: {situation}"
+    if not coping_results:
+        return f"No specific coping strategies found for: {situation}"
 
-        output = f"Coping strategies for '{situation}':\n\n"
-        for i, mem in enumerate(coping_results, 1):
-            memory_text = mem.get("memory", "No content")
-            output += f"{i}. {memory_text}\n\n"
+    return f"Coping strategies for '{situation}':\n\n" + "".join(
+        f"{i}. {_memory_text(mem)}\n\n" for i, mem in enumerate(coping_results, 1)
+    )
 
-        return output
 
-    except Exception as e:
-        return f"Error: {str(e)}"
-
-
-@mcp.tool()
+@api_tool
 def get_thinking_traps() -> str:
     """
     List all identified thinking traps and cognitive distortions.
@@ -392,35 +399,30 @@ def get_thinking_traps() -> str:
     Returns:
         List of thinking traps with descriptions.
     """
-    if not check_api():
-        return "Error: Local Memory server is not running. Please run 'brain start' in terminal."
-
-    try:
-        # Use direct endpoint with category filter (no LLM needed)
-        response = requests.get(
-            f"{API_URL}/direct/list",
-            params={"category": "thinking_trap", "limit": 15},
-            timeout=30
-        )
+    # Use direct endpoint with category filter (no LLM needed)
+    response = CLIENT.get(
+        "/direct/list",
+        params={"category": "thinking_trap", "limit": 15},
+        timeout=30
+    )
 
-        if response.status_code != 200:
-            return f"Error searching: {response.text}"
+    if response.status_code != 200:
+        return f"Error searching: {response.text}"
 
-        data = response.json()
-        results = data.get("results", [])
+    data = _loads(response.content)
+    results = data.get("results", [])
 
-        if not results:
-            return "No thinking traps found in memory."
+    if not results:
+        return "No thinking traps found in memory."
 
-        output = "Identified thinking traps:\n\n"
-        for i, mem in enumerate(results, 1):
-            memory_text = mem.get("memory", "No content")
-            output += f"{i}. {memory_text}\n\n"
+    return "Identified thinking traps:\n\n" + "".join(
+        f"{i}. {_memory_text(mem)}\n\n" for i, mem in enumerate(results, 1)
+    )
 
-        return output
 
-    except Exception as e:
-        return f"Error: {str(e)}"
+if ENABLE_EMOTIONAL_TOOLS:
+    for _tool in (search_emotional_patterns, get_coping_strategies, get_thinking_traps):
+        mcp.tool()(_tool)
 
 
 if __name__ == "__main__":
@@ -3,29 +3,43 @@
 Local Memory CLI Tool
 Usage:
     mem add "Your insight here" --cat coding
+    mem add-bulk entries.jsonl --cat journal
     mem search "what is my preference"
     mem list
     mem delete <memory_id>
 """
 import sys
-import argparse
-from mem0 import Memory
-from config import MEM0_CONFIG, USER_ID
+import json
+import time
+import functools
+from config import USER_ID, mem0_config
 
-# Initialize Memory instance with Chroma
-try:
-    m = Memory.from_config(MEM0_CONFIG)
-except Exception as e:
-    print(f"Error initializing memory: {e}")
-    print("Make sure Ollama is running: brew services start ollama")
-    sys.exit(1)
+SEPARATOR = "-" * 50 + "\n"
+
+
+@functools.lru_cache(maxsize=1)
+def memory():
+    """Process-wide Memory instance, initialized with Chroma on first use.
+
+    Import this instead of calling Memory.from_config() so scripts that
+    reuse the CLI helpers share one Chroma/Ollama client.
+    """
+    # Deferred so `mem --help` doesn't pay for mem0/Chroma/Ollama startup
+    from mem0 import Memory
+
+    try:
+        return Memory.from_config(mem0_config())
+    except Exception as e:
+        print(f"Error initializing memory: {e}")
+        print("Make sure Ollama is running: brew services start ollama")
+        sys.exit(1)
 
 
 def add_memory(text: str, category: str = "general"):
     """Add a memory with optional category."""
     print(f"Processing into local brain...")
     try:
-        result = m.add(
+        result = memory().add(
             text,
             user_id=USER_ID,
             metadata={"category": category, "source": "cli"}
@@ -39,28 +53,63 @@ def add_memory(text: str, category: str = "general"):
         sys.exit(1)
 
 
+def add_bulk(path: str, category: str = "general"):
+    """Add one memory per JSONL record ({"text": ..., "category": ...}) with a shared Memory instance."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError) as e:
+        print(f"Error reading {path}: {e}")
+        sys.exit(1)
+
+    # mem0 treats a list passed to add() as one conversation, so records are
+    # added one at a time; reusing the instance still saves re-initialization
+    mem = memory()
+    saved = 0
+    start = time.perf_counter()
+    for i, record in enumerate(records, 1):
+        if not isinstance(record, dict):
+            print(f"  Skipping record {i}: not a JSON object")
+            continue
+        text = record.get("text")
+        if not text:
+            print(f"  Skipping record {i}: missing 'text'")
+            continue
+        try:
+            mem.add(
+                text,
+                user_id=USER_ID,
+                metadata={"category": record.get("category", category), "source": "cli"}
+            )
+            saved += 1
+        except Exception as e:
+            print(f"  Error adding record {i}: {e}")
+
+    print(f"Saved {saved}/{len(records)} memories in {time.perf_counter() - start:.1f}s")
+    if records and not saved:
+        sys.exit(1)
+
+
 def search_memory(query: str, limit: int = 5):
     """Search memories by query."""
     try:
-        results = m.search(query, user_id=USER_ID, limit=limit)
+        results = memory().search(query, user_id=USER_ID, limit=limit)
 
         if not results.get("results"):
             print("No related memories found.")
             return
 
-        print(f"\nFound {len(results['results'])} related memories:\n")
-        print("-" * 50)
+        parts = [f"\nFound {len(results['results'])} related memories:\n\n", SEPARATOR]
         for i, res in enumerate(results["results"], 1):
-            memory = res.get("memory", "No content")
+            memory_text = res.get("memory", "No content")
             score = res.get("score", 0.0)
             mem_id = res.get("id", "N/A")
             metadata = res.get("metadata", {})
             category = metadata.get("category", "general")
 
-            print(f"[{i}] (Score: {score:.2f}) [{category}]")
-            print(f"    {memory}")
-            print(f"    ID: {mem_id}")
-            print("-" * 50)
+            parts.append(f"[{i}] (Score: {score:.2f}) [{category}]\n    {memory_text}\n    ID: {mem_id}\n")
+            parts.append(SEPARATOR)
+        sys.stdout.write("".join(parts))
     except Exception as e:
         print(f"Error searching: {e}")
         sys.exit(1)
@@ -69,23 +118,22 @@ def search_memory(query: str, limit: int = 5):
 def list_memories(limit: int = 20):
     """List all memories."""
     try:
-        results = m.get_all(user_id=USER_ID, limit=limit)
+        results = memory().get_all(user_id=USER_ID, limit=limit)
 
         if not results.get("results"):
             print("No memories found.")
             return
 
-        print(f"\nShowing {len(results['results'])} memories:\n")
-        print("-" * 50)
+        parts = [f"\nShowing {len(results['results'])} memories:\n\n", SEPARATOR]
         for i, res in enumerate(results["results"], 1):
-            memory = res.get("memory", "No content")
+            memory_text = res.get("memory", "No content")
             mem_id = res.get("id", "N/A")
             metadata = res.get("metadata", {})
             category = metadata.get("category", "general")
 
-            print(f"[{i}] [{category}] {memory[:80]}{'...' if len(memory) > 80 else ''}")
-            print(f"    ID: {mem_id}")
-            print("-" * 50)
+            parts.append(f"[{i}] [{category}] {memory_text[:80]}{'...' if len(memory_text) > 80 else ''}\n    ID: {mem_id}\n")
+            parts.append(SEPARATOR)
+        sys.stdout.write("".join(parts))
     except Exception as e:
         print(f"Error listing memories: {e}")
         sys.exit(1)
@@ -94,14 +142,73 @@ def list_memories(limit: int = 20):
 def delete_memory(memory_id: str):
     """Delete a specific memory by ID."""
     try:
-        m.delete(memory_id)
+        memory().delete(memory_id)
         print(f"Deleted memory: {memory_id}")
     except Exception as e:
         print(f"Error deleting memory: {e}")
         sys.exit(1)
 
 
+def _split_args(args: list[str], flags: tuple[str, ...]):
+    """Split args into (positionals, flag value), or None if argparse should handle them."""
+    positionals, value = [], None
+    i = 0
+    while i < len(args):
+        if args[i] in flags and i + 1 < len(args):
+            value = args[i + 1]
+            i += 2
+        elif args[i].startswith("-"):
+            return None
+        else:
+            positionals.append(args[i])
+            i += 1
+    return positionals, value
+
+
+def _fast_dispatch(argv: list[str]) -> bool:
+    """Run well-formed commands straight from argv, skipping argparse setup.
+
+    Returns False for help, unknown commands and anything unusual so that
+    main() can fall back to argparse for full parsing and error messages.
+    """
+    if not argv:
+        return False
+    command, rest = argv[0], argv[1:]
+
+    if command in ("add", "add-bulk"):
+        parsed = _split_args(rest, ("--cat", "-c"))
+        if not parsed or len(parsed[0]) != 1:
+            return False
+        handler = add_memory if command == "add" else add_bulk
+        handler(parsed[0][0], parsed[1] or "general")
+    elif command in ("search", "list"):
+        parsed = _split_args(rest, ("--limit", "-n"))
+        positional_count = 1 if command == "search" else 0
+        if not parsed or len(parsed[0]) != positional_count:
+            return False
+        # isdigit() also accepts digits like "²" that int() rejects
+        if parsed[1] is not None and not (parsed[1].isascii() and parsed[1].isdecimal()):
+            return False
+        if command == "search":
+            search_memory(parsed[0][0], int(parsed[1] or 5))
+        else:
+            list_memories(int(parsed[1] or 20))
+    elif command == "delete":
+        if len(rest) != 1 or rest[0].startswith("-"):
+            return False
+        delete_memory(rest[0])
+    else:
+        return False
+    return True
+
+
 def main():
+    if _fast_dispatch(sys.argv[1:]):
+        return
+
+    # Only needed for --help, usage errors and unusual argument forms
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Local Memory CLI - Your personal knowledge base",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -109,6 +216,7 @@ def main():
 Examples:
     mem add "I prefer Loguru for Python logging"
     mem add "Project X uses PostgreSQL" --cat project_x
+    mem add-bulk entries.jsonl --cat journal
     mem search "logging preference"
     mem list
     mem delete <memory_id>
@@ -126,6 +234,16 @@ Examples:
         help="Category tag (e.g., coding, project_x)"
     )
 
+    # Bulk add command
+    add_bulk_parser = subparsers.add_parser("add-bulk", help="Add memories from a JSONL file")
+    add_bulk_parser.add_argument("path", type=str, help="JSONL file with one {\"text\": ...} object per line")
+    add_bulk_parser.add_argument(
+        "--cat", "-c",
+        type=str,
+        default="general",
+        help="Category for records without their own \"category\" (default: general)"
+    )
+
     # Search command
     search_parser = subparsers.add_parser("search", help="Search memories")
     search_parser.add_argument("query", type=str, help="What are you looking for?")
@@ -153,6 +271,8 @@ Examples:
 
     if args.command == "add":
         add_memory(args.text, args.cat)
+    elif args.command == "add-bulk":
+        add_bulk(args.path, args.cat)
     elif args.command == "search":
         search_memory(args.query, args.limit)
     elif args.command == "list":
@@ -4,29 +4,92 @@ Local Memory FastAPI Server
 Provides HTTP endpoints for Chrome extension and MCP integration.
 
 Endpoints:
-    POST /add - Add a memory
+    POST /add - Add a memory (LLM-mediated extraction, low throughput)
     GET /search - Search memories
     GET /list - List all memories
     DELETE /delete/{memory_id} - Delete a memory
+    POST /direct/add_many - Add many memories with batched embeddings (no LLM)
+    POST /bulk_import - Import many memories without LLM extraction (high throughput)
     GET /health - Health check
+
+Set LOCAL_MEMORY_DIRECT=0 to leave out the LLM-free /direct/* endpoints.
 """
-from fastapi import FastAPI, HTTPException, Query
+import asyncio
+import hashlib
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+import time
+from fastapi import APIRouter, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Optional
 from mem0 import Memory
+import numpy as np
 import uvicorn
 import chromadb
-import ollama
+import httpx
 from pathlib import Path
 from datetime import datetime, timedelta
+from uuid import uuid4
+
+from config import (
+    USER_ID, SERVER_HOST, SERVER_PORT, SERVER_WORKERS, CHROMA_PATH, CATEGORY_TTL, DEFAULT_TTL_DAYS,
+    OLLAMA_BASE_URL, EMBED_MODEL, EMBED_BATCH_SIZE, DIRECT_ENDPOINTS, PRUNE_INTERVAL_MINUTES,
+    mem0_config
+)
+
+try:
+    import orjson
+
+    class FastJSONResponse(JSONResponse):
+        """JSON response rendered by orjson (faster on large /list and /search payloads)."""
+
+        def render(self, content) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    FastJSONResponse = JSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Hold one keep-alive Ollama client and the prune loop for the lifetime of the server."""
+    app.state.ollama = httpx.AsyncClient(
+        base_url=OLLAMA_BASE_URL,
+        limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0),
+        timeout=httpx.Timeout(60.0, connect=10.0)
+    )
+    # Load the embedding model and open a connection before the first request
+    try:
+        await get_embeddings(["warmup"])
+    except httpx.HTTPError as e:
+        print(f"Embedding warm-up failed (is Ollama running?): {e}")
+    prune_task = None
+    if m:
+        try:
+            await run_in_threadpool(backfill_expiry_timestamps)
+        except Exception as e:
+            print(f"Expiry timestamp backfill failed: {e}")
+        try:
+            await run_in_threadpool(normalize_stored_embeddings)
+        except Exception as e:
+            print(f"Embedding normalization failed: {e}")
+        if PRUNE_INTERVAL_MINUTES > 0:
+            prune_task = asyncio.create_task(prune_loop())
+    yield
+    if prune_task:
+        prune_task.cancel()
+    await app.state.ollama.aclose()
 
-from config import MEM0_CONFIG, USER_ID, SERVER_HOST, SERVER_PORT, CHROMA_PATH, PROJECT_CATEGORIES, DEFAULT_TTL_DAYS
 
 app = FastAPI(
     title="Local Memory API",
     description="Local memory bridge for AI assistants",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Enable CORS for Chrome extension
@@ -38,10 +101,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (/list, /search, /expired); memory text compresses well
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize Memory instance with Chroma
 print("Initializing Memory with OpenRouter (cloud LLM) + Ollama (local embeddings) + Chroma...")
 try:
-    m = Memory.from_config(MEM0_CONFIG)
+    m = Memory.from_config(mem0_config())
     print("Memory Brain Loaded!")
 except Exception as e:
     print(f"Error loading memory: {e}")
@@ -50,6 +116,8 @@ except Exception as e:
 
 
 class MemoryItem(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     text: str
     user_id: str = USER_ID
     category: str = "general"
@@ -58,16 +126,12 @@ class MemoryItem(BaseModel):
     ttl_days: Optional[int] = None  # None = never expires
 
 
-class SessionData(BaseModel):
-    transcript: list[dict] = []
-    cwd: str = ""
-    session_id: str = ""
-
-
 class MemoryResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     status: str
     message: str
-    data: Optional[dict] = None
+    data: Optional[dict[str, Any]] = None
 
 
 @app.get("/health")
@@ -82,35 +146,41 @@ async def health_check():
 
 @app.post("/add", response_model=MemoryResponse)
 async def add_memory(item: MemoryItem):
-    """Add a new memory with project categorization and optional TTL."""
+    """
+    Add a new memory with project categorization and optional TTL.
+
+    mem0 runs an LLM extraction pass on every call, so this is the slow
+    path; use /bulk_import or /direct/add for text that is already distilled.
+    """
     if not m:
         raise HTTPException(status_code=503, detail="Memory not initialized")
 
     try:
         # Build metadata
+        now = datetime.now()
         metadata = {
             "category": item.category,
             "project": item.project,
             "source": item.source,
-            "created_at": datetime.now().isoformat()
+            "created_at": now.isoformat()
         }
 
         # Calculate expiration if TTL specified or category has default TTL
-        ttl = item.ttl_days
-        if ttl is None and item.project in PROJECT_CATEGORIES:
-            cat_config = PROJECT_CATEGORIES[item.project].get(item.category, {})
-            ttl = cat_config.get("ttl_days")
+        ttl = item.ttl_days if item.ttl_days is not None else CATEGORY_TTL.get((item.project, item.category))
 
         if ttl is not None:
-            expires_at = datetime.now() + timedelta(days=ttl)
+            expires_at = now + timedelta(days=ttl)
             metadata["expires_at"] = expires_at.isoformat()
+            metadata["expires_at_ts"] = int(expires_at.timestamp())
             metadata["ttl_days"] = ttl
 
-        result = m.add(
+        result = await run_in_threadpool(
+            m.add,
             item.text,
             user_id=item.user_id,
             metadata=metadata
         )
+        invalidate_stats()
         return MemoryResponse(
             status="success",
             message=f"Memory saved [{item.project}:{item.category}]",
@@ -121,20 +191,9 @@ async def add_memory(item: MemoryItem):
 
 
 def filter_expired(results: list) -> list:
-    """Filter out expired memories."""
-    now = datetime.now()
-    valid = []
-    for r in results:
-        expires_at = r.get("metadata", {}).get("expires_at")
-        if expires_at:
-            try:
-                exp_date = datetime.fromisoformat(expires_at)
-                if exp_date < now:
-                    continue  # Skip expired
-            except ValueError:
-                pass  # Invalid date format, keep it
-        valid.append(r)
-    return valid
+    """Drop expired memories the background prune hasn't deleted yet (integer compare only)."""
+    now_ts = int(time.time())
+    return [r for r in results if r.get("metadata", {}).get("expires_at_ts", now_ts + 1) > now_ts]
 
 
 @app.get("/search")
@@ -149,19 +208,16 @@ async def search_memory(
         raise HTTPException(status_code=503, detail="Memory not initialized")
 
     try:
-        # Fetch more results to account for expired ones being filtered
-        results = m.search(q, user_id=user_id, limit=limit * 2)
-        memories = results.get("results", [])
-
-        # Filter by project if specified
-        if project:
-            memories = [r for r in memories if r.get("metadata", {}).get("project") == project]
-
-        # Filter out expired memories
-        memories = filter_expired(memories)
-
-        # Limit to requested count
-        memories = memories[:limit]
+        # Project filter runs in Chroma. Expired rows are normally deleted by
+        # prune_loop; without it, over-fetch to make up for the ones dropped here
+        results = await run_in_threadpool(
+            m.search,
+            q,
+            user_id=user_id,
+            limit=limit if PRUNE_INTERVAL_MINUTES > 0 else limit * 2,
+            filters={"project": project} if project else None
+        )
+        memories = filter_expired(results.get("results", []))[:limit]
 
         return {
             "status": "success",
@@ -184,19 +240,17 @@ async def list_memories(
         raise HTTPException(status_code=503, detail="Memory not initialized")
 
     try:
-        # Fetch more results to account for filtered ones
-        results = m.get_all(user_id=user_id, limit=limit * 2)
+        # Fetch more results when some will be filtered out below
+        overfetch = project or PRUNE_INTERVAL_MINUTES <= 0
+        results = await run_in_threadpool(m.get_all, user_id=user_id, limit=limit * 2 if overfetch else limit)
         memories = results.get("results", [])
 
-        # Filter by project if specified
+        # Filter by project if specified (get_all only takes filters in newer mem0)
         if project:
             memories = [r for r in memories if r.get("metadata", {}).get("project") == project]
 
-        # Filter out expired memories
-        memories = filter_expired(memories)
-
-        # Limit to requested count
-        memories = memories[:limit]
+        # Drop expired memories not yet pruned, then limit to requested count
+        memories = filter_expired(memories)[:limit]
 
         return {
             "status": "success",
@@ -214,7 +268,8 @@ async def delete_memory(memory_id: str):
         raise HTTPException(status_code=503, detail="Memory not initialized")
 
     try:
-        m.delete(memory_id)
+        await run_in_threadpool(m.delete, memory_id)
+        invalidate_stats()
         return {
             "status": "success",
             "message": f"Deleted memory: {memory_id}"
@@ -233,47 +288,77 @@ async def get_project_context(
         raise HTTPException(status_code=503, detail="Memory not initialized")
 
     try:
-        results = m.search(project, user_id=USER_ID, limit=limit)
+        results = await run_in_threadpool(m.search, project, user_id=USER_ID, limit=limit)
         memories = results.get("results", [])
 
         # Format as context string
-        context_lines = []
-        for mem in memories:
-            text = mem.get("memory", "")
-            if text:
-                context_lines.append(f"- {text}")
+        context = "\n".join(f"- {text}" for mem in memories if (text := mem.get("memory", "")))
 
         return {
             "status": "success",
             "project": project,
-            "context": "\n".join(context_lines),
+            "context": context,
             "count": len(memories)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Stats responses are cached briefly and dropped whenever memories change
+STATS_TTL_SECONDS = 30.0
+_stats_cache = {}  # endpoint name -> (monotonic timestamp, response)
+_stats_generation = 0  # bumped on every write
+
+
+def get_cached_stats(name: str) -> dict | None:
+    """Return a fresh cached stats response, if any."""
+    cached = _stats_cache.get(name)
+    if cached and time.monotonic() - cached[0] < STATS_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def cache_stats(name: str, response: dict, generation: int) -> dict:
+    """Store a stats response and return it.
+
+    `generation` is the _stats_generation read before the data was fetched;
+    if a write landed in between, the response is returned but not cached.
+    """
+    if generation == _stats_generation:
+        _stats_cache[name] = (time.monotonic(), response)
+    return response
+
+
+def invalidate_stats():
+    """Drop cached stats after a write."""
+    global _stats_generation
+    _stats_generation += 1
+    _stats_cache.clear()
+
+
 @app.get("/stats")
 async def get_stats():
     """Get memory statistics."""
     if not m:
         raise HTTPException(status_code=503, detail="Memory not initialized")
 
+    cached = get_cached_stats("stats")
+    if cached:
+        return cached
+
+    generation = _stats_generation
     try:
-        all_memories = m.get_all(user_id=USER_ID, limit=1000)
+        all_memories = await run_in_threadpool(m.get_all, user_id=USER_ID, limit=1000)
         memories = all_memories.get("results", [])
 
         # Count by category
-        categories = {}
-        for mem in memories:
-            cat = mem.get("metadata", {}).get("category", "general")
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(mem.get("metadata", {}).get("category", "general") for mem in memories)
 
-        return {
+        return cache_stats("stats", {
             "status": "success",
             "total_memories": len(memories),
-            "by_category": categories
-        }
+            "by_category": dict(categories)
+        }, generation)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -288,100 +373,274 @@ def get_chroma_collection():
     raise HTTPException(status_code=503, detail="Memory not initialized")
 
 
-def get_embedding(text: str) -> list[float]:
-    """Get embedding from local Ollama."""
-    response = ollama.embeddings(model="nomic-embed-text", prompt=text)
-    return response["embedding"]
+# Recently embedded texts (mostly repeated search queries), keyed by digest
+EMBED_CACHE_SIZE = 2048
+_embedding_cache = OrderedDict()  # blake2b digest -> embedding, oldest first
+_embedding_inflight = {}  # blake2b digest -> task embedding that text
 
 
-@app.post("/direct/add")
-async def direct_add(item: MemoryItem):
-    """
-    Direct add to ChromaDB - bypasses LLM extraction.
-    Use when the caller (e.g., Claude) has already extracted the insight.
-    Only uses local Ollama embeddings.
+def _store_embedding(key: bytes, task: asyncio.Task):
+    """Move a finished embedding task's result into the LRU cache."""
+    _embedding_inflight.pop(key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    _embedding_cache[key] = task.result()[0]
+    if len(_embedding_cache) > EMBED_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+async def get_embedding(text: str) -> np.ndarray:
+    """Get embedding from local Ollama, reusing results for recently seen text."""
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    cached = _embedding_cache.get(key)
+    if cached is not None:
+        _embedding_cache.move_to_end(key)
+        return cached
+
+    # Concurrent requests for the same text share a single Ollama call
+    task = _embedding_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(get_embeddings([text]))
+        _embedding_inflight[key] = task
+        task.add_done_callback(lambda done: _store_embedding(key, done))
+    # Shielded so one cancelled request doesn't cancel the others' call
+    return (await asyncio.shield(task))[0]
+
+
+async def get_embeddings(texts: list[str]) -> np.ndarray:
+    """Embed many texts with one Ollama /api/embed call per EMBED_BATCH_SIZE texts.
+
+    Returns a single (len(texts), dim) float32 array, which Chroma stores as-is.
     """
+    batches = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        response = await app.state.ollama.post(
+            "/api/embed",
+            json={"model": EMBED_MODEL, "input": texts[start:start + EMBED_BATCH_SIZE]}
+        )
+        response.raise_for_status()
+        batches.append(np.asarray(response.json()["embeddings"], dtype=np.float32))
+    return batches[0] if len(batches) == 1 else np.concatenate(batches)
+
+
+class MemoryBatch(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    items: list[MemoryItem]
+
+
+def build_direct_metadata(item: MemoryItem, now: datetime) -> dict:
+    """Build the ChromaDB metadata stored alongside a directly added memory."""
+    metadata = {
+        "category": item.category,
+        "project": item.project,
+        "source": item.source,
+        "created_at": now.isoformat(),
+        "user_id": item.user_id,
+        "data": item.text  # Store full text in metadata too
+    }
+
+    # Calculate expiration if applicable
+    ttl = item.ttl_days if item.ttl_days is not None else CATEGORY_TTL.get((item.project, item.category))
+
+    if ttl is not None:
+        expires_at = now + timedelta(days=ttl)
+        metadata["expires_at"] = expires_at.isoformat()
+        metadata["expires_at_ts"] = int(expires_at.timestamp())
+        metadata["ttl_days"] = ttl
+
+    return metadata
+
+
+def chroma_max_batch_size() -> int:
+    """Largest number of rows ChromaDB accepts in one add() or update() call."""
+    return m.vector_store.client.get_max_batch_size()
+
+
+async def insert_direct(items: list[MemoryItem]) -> list[str]:
+    """Embed items in batches and insert them into ChromaDB in as few add() calls as it allows."""
+    collection = get_chroma_collection()
+    texts = [item.text for item in items]
+    embeddings = await get_embeddings(texts)
+
+    # Generate unique IDs (random, so the memory text is never hashed)
+    ids = [uuid4().hex[:16] for _ in items]
+    now = datetime.now()
+    metadatas = [build_direct_metadata(item, now) for item in items]
+
+    # Insert directly into ChromaDB, split at its max batch size
+    step = chroma_max_batch_size()
     try:
-        # Get embedding from local Ollama
-        embedding = get_embedding(item.text)
-        collection = get_chroma_collection()
+        for start in range(0, len(ids), step):
+            end = start + step
+            await run_in_threadpool(
+                collection.add,
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=texts[start:end],
+                metadatas=metadatas[start:end]
+            )
+    finally:
+        invalidate_stats()  # earlier chunks are stored even if a later one fails
+    return ids
+
+
+def backfill_expiry_timestamps():
+    """Add expires_at_ts to memories with a TTL that were stored before it existed."""
+    collection = get_chroma_collection()
+    # Every memory with an expiry also has ttl_days. Chroma can't filter on a
+    # missing key, so compare id-only reads and load metadata just for the
+    # TTL'd rows that still lack expires_at_ts.
+    ttl_ids = collection.get(where={"ttl_days": {"$gte": 0}}, include=[])["ids"]
+    if not ttl_ids:
+        return
+    stamped = set(collection.get(where={"expires_at_ts": {"$gte": 0}}, include=[])["ids"])
+    missing_ids = [doc_id for doc_id in ttl_ids if doc_id not in stamped]
+
+    backfilled = 0
+    step = chroma_max_batch_size()
+    for start in range(0, len(missing_ids), step):
+        legacy = collection.get(ids=missing_ids[start:start + step], include=["metadatas"])
+
+        ids, metadatas = [], []
+        for doc_id, meta in zip(legacy["ids"], legacy["metadatas"], strict=True):
+            if not meta.get("expires_at"):
+                continue
+            try:
+                meta["expires_at_ts"] = int(datetime.fromisoformat(meta["expires_at"]).timestamp())
+            except ValueError:
+                continue  # Invalid date format, never expires
+            ids.append(doc_id)
+            metadatas.append(meta)
 
-        # Build metadata
-        metadata = {
-            "category": item.category,
-            "project": item.project,
-            "source": item.source,
-            "created_at": datetime.now().isoformat(),
-            "user_id": item.user_id,
-            "data": item.text  # Store full text in metadata too
-        }
+        if ids:
+            collection.update(ids=ids, metadatas=metadatas)
+            backfilled += len(ids)
 
-        # Calculate expiration if applicable
-        ttl = item.ttl_days
-        if ttl is None and item.project in PROJECT_CATEGORIES:
-            cat_config = PROJECT_CATEGORIES[item.project].get(item.category, {})
-            ttl = cat_config.get("ttl_days")
+    if backfilled:
+        print(f"Backfilled expires_at_ts on {backfilled} memories")
 
-        if ttl is not None:
-            expires_at = datetime.now() + timedelta(days=ttl)
-            metadata["expires_at"] = expires_at.isoformat()
-            metadata["ttl_days"] = ttl
 
-        # Generate unique ID
-        import hashlib
-        doc_id = hashlib.md5(f"{item.text}{datetime.now().isoformat()}".encode()).hexdigest()[:16]
+# Written once every stored vector has been rescaled to unit length
+EMBEDDINGS_NORMALIZED_MARKER = CHROMA_PATH / ".embeddings_normalized"
 
-        # Insert directly into ChromaDB
-        collection.add(
-            ids=[doc_id],
-            embeddings=[embedding],
-            documents=[item.text],
-            metadatas=[metadata]
-        )
 
+def normalize_stored_embeddings():
+    """
+    Rescale stored vectors to unit length, once per Chroma directory.
+
+    New vectors come from Ollama's /api/embed (the direct endpoints here,
+    mem0's Ollama embedder via client.embed), which L2-normalizes them.
+    Rows written through the older /api/embeddings endpoint are not, and
+    mixing both scales skews L2 ranking and the /direct/search score.
+    Rescaling gives the vector /api/embed returns for the same text.
+    """
+    if EMBEDDINGS_NORMALIZED_MARKER.exists():
+        return
+
+    collection = get_chroma_collection()
+    step = chroma_max_batch_size()
+    rescaled = 0
+    for offset in range(0, collection.count(), step):
+        page = collection.get(limit=step, offset=offset, include=["embeddings"])
+        if not page["ids"]:
+            break
+        embeddings = np.asarray(page["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1)
+        stale = (np.abs(norms - 1) > 1e-3) & (norms > 0)
+        if stale.any():
+            ids = [doc_id for doc_id, is_stale in zip(page["ids"], stale, strict=True) if is_stale]
+            collection.update(ids=ids, embeddings=embeddings[stale] / norms[stale, np.newaxis])
+            rescaled += len(ids)
+
+    EMBEDDINGS_NORMALIZED_MARKER.touch()
+    if rescaled:
+        print(f"Rescaled {rescaled} stored embeddings to unit length")
+
+
+# LLM-free endpoints, mounted below only when DIRECT_ENDPOINTS is enabled
+direct_router = APIRouter()
+
+# Fields fetched by /direct/search and /direct/list
+SEARCH_INCLUDE = ["documents", "metadatas", "distances"]
+LIST_INCLUDE = ["documents", "metadatas"]
+
+
+@direct_router.post("/direct/add")
+async def direct_add(item: MemoryItem):
+    """
+    Direct add to ChromaDB - bypasses LLM extraction.
+    Use when the caller (e.g., Claude) has already extracted the insight.
+    Only uses local Ollama embeddings.
+    """
+    try:
+        ids = await insert_direct([item])
         return MemoryResponse(
             status="success",
             message=f"Memory saved directly [{item.project}:{item.category}]",
-            data={"id": doc_id}
+            data={"id": ids[0]}
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/direct/search")
+@direct_router.post("/direct/add_many")
+async def direct_add_many(batch: MemoryBatch):
+    """
+    Batched direct add - one Ollama call per EMBED_BATCH_SIZE texts and a
+    single ChromaDB insert, with no LLM extraction.
+    """
+    if not batch.items:
+        return MemoryResponse(status="success", message="No memories to save", data={"ids": []})
+
+    try:
+        ids = await insert_direct(batch.items)
+        return MemoryResponse(
+            status="success",
+            message=f"Saved {len(ids)} memories directly",
+            data={"ids": ids}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+
+@direct_router.get("/direct/search")
 async def direct_search(
     q: str = Query(..., description="Search query"),
     limit: int = Query(5, description="Number of results"),
-    category: str = Query(None, description="Filter by category")
+    category: str = Query(None, description="Filter by category"),
+    categories: str = Query(None, description="Filter by any of these comma-separated categories")
 ):
     """Direct ChromaDB search - no LLM needed, uses local embeddings only."""
     try:
-        query_embedding = get_embedding(q)
+        query_embedding = await get_embedding(q)
         collection = get_chroma_collection()
 
         where_filter = None
         if category:
             where_filter = {"category": category}
+        elif categories:
+            where_filter = {"category": {"$in": categories.split(",")}}
 
-        results = collection.query(
-            query_embeddings=[query_embedding],
+        results = await run_in_threadpool(
+            collection.query,
+            query_embeddings=query_embedding[np.newaxis],
             n_results=limit,
             where=where_filter,
-            include=["documents", "metadatas", "distances"]
+            include=SEARCH_INCLUDE
         )
 
-        formatted = []
-        if results["documents"] and results["documents"][0]:
-            for i, doc in enumerate(results["documents"][0]):
-                meta = results["metadatas"][0][i] if results["metadatas"] else {}
-                # Memory text can be in document or in metadata.data
-                memory_text = doc or meta.get("data", "")
-                formatted.append({
-                    "memory": memory_text,
-                    "metadata": meta,
-                    "score": 1 - (results["distances"][0][i] if results["distances"] else 0),
-                    "id": results["ids"][0][i] if results["ids"] else None
-                })
+        # One query was sent, so each field holds a single row of results
+        docs = results["documents"][0] if results["documents"] else []
+        metas = results["metadatas"][0] if results["metadatas"] else [{}] * len(docs)
+        dists = results["distances"][0] if results["distances"] else [0.0] * len(docs)
+        ids = results["ids"][0] if results["ids"] else [None] * len(docs)
+
+        # Memory text can be in document or in metadata.data
+        formatted = [
+            {"memory": doc or meta.get("data", ""), "metadata": meta, "score": 1 - dist, "id": doc_id}
+            for doc, meta, dist, doc_id in zip(docs, metas, dists, ids, strict=True)
+        ]
 
         return {
             "status": "success",
@@ -392,7 +651,7 @@ async def direct_search(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/direct/list")
+@direct_router.get("/direct/list")
 async def direct_list(
     limit: int = Query(20, description="Number of results"),
     category: str = Query(None, description="Filter by category")
@@ -404,22 +663,21 @@ async def direct_list(
         if category:
             where_filter = {"category": category}
 
-        results = collection.get(
+        results = await run_in_threadpool(
+            collection.get,
             limit=limit,
             where=where_filter,
-            include=["documents", "metadatas"]
+            include=LIST_INCLUDE
         )
 
-        formatted = []
-        if results["documents"]:
-            for i, doc in enumerate(results["documents"]):
-                meta = results["metadatas"][i] if results["metadatas"] else {}
-                memory_text = doc or meta.get("data", "")
-                formatted.append({
-                    "memory": memory_text,
-                    "metadata": meta,
-                    "id": results["ids"][i] if results["ids"] else None
-                })
+        docs = results["documents"] or []
+        metas = results["metadatas"] or [{}] * len(docs)
+        ids = results["ids"] or [None] * len(docs)
+
+        formatted = [
+            {"memory": doc or meta.get("data", ""), "metadata": meta, "id": doc_id}
+            for doc, meta, doc_id in zip(docs, metas, ids, strict=True)
+        ]
 
         return {
             "status": "success",
@@ -429,37 +687,98 @@ async def direct_list(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/direct/stats")
+@direct_router.get("/direct/stats")
 async def direct_stats():
     """Direct stats from ChromaDB."""
+    cached = get_cached_stats("direct_stats")
+    if cached:
+        return cached
+
+    generation = _stats_generation
     try:
         collection = get_chroma_collection()
-        all_docs = collection.get(include=["metadatas"])
+        all_docs = await run_in_threadpool(collection.get, include=["metadatas"])
         total = len(all_docs["ids"]) if all_docs["ids"] else 0
 
-        categories = {}
-        if all_docs["metadatas"]:
-            for meta in all_docs["metadatas"]:
-                cat = meta.get("category", "general")
-                categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(meta.get("category", "general") for meta in all_docs["metadatas"] or [])
 
-        return {
+        return cache_stats("direct_stats", {
             "status": "success",
             "total_memories": total,
-            "by_category": categories
-        }
+            "by_category": dict(categories)
+        }, generation)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+if DIRECT_ENDPOINTS:
+    app.include_router(direct_router)
+
+
+@app.post("/bulk_import", response_model=MemoryResponse)
+async def bulk_import(batch: MemoryBatch):
+    """
+    Import many memories without LLM extraction.
+
+    Goes through the same path as /direct/add_many: one Ollama call per
+    EMBED_BATCH_SIZE texts and no m.add(), so N items cost no LLM calls.
+    """
+    return await direct_add_many(batch)
+
+
 # ===== MEMORY PRUNING ENDPOINT =====
 
 class PruneResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     status: str
     pruned_count: int
     total_before: int
     total_after: int
-    by_category: dict
+    by_category: dict[str, int]
+
+
+def prune_expired(dry_run: bool = False) -> PruneResponse:
+    """Delete memories whose expires_at_ts has passed (blocking; run in a thread)."""
+    collection = get_chroma_collection()
+    total_before = collection.count()
+
+    # Only expired rows are read; the rest of the collection stays in Chroma
+    expired = collection.get(
+        where={"expires_at_ts": {"$lte": int(time.time())}},
+        include=["metadatas"]
+    )
+    expired_ids = expired["ids"]
+
+    expired_by_category = Counter(meta.get("category", "general") for meta in expired["metadatas"] or [])
+
+    # Delete expired memories (unless dry run). Deleting by the ids just
+    # read keeps the reported counts exact.
+    if expired_ids and not dry_run:
+        collection.delete(ids=expired_ids)
+        invalidate_stats()
+
+    total_after = total_before - len(expired_ids) if not dry_run else total_before
+
+    return PruneResponse(
+        status="dry_run" if dry_run else "success",
+        pruned_count=len(expired_ids),
+        total_before=total_before,
+        total_after=total_after,
+        by_category=dict(expired_by_category)
+    )
+
+
+async def prune_loop():
+    """Prune expired memories at startup and then every PRUNE_INTERVAL_MINUTES."""
+    while True:
+        try:
+            result = await run_in_threadpool(prune_expired)
+            if result.pruned_count:
+                print(f"Pruned {result.pruned_count} expired memories")
+        except Exception as e:
+            print(f"Background prune failed: {e}")
+        await asyncio.sleep(PRUNE_INTERVAL_MINUTES * 60)
 
 
 @app.post("/prune", response_model=PruneResponse)
@@ -469,56 +788,11 @@ async def prune_expired_memories(
     """
     Prune expired memories based on their TTL.
 
-    Memories with an `expires_at` field in metadata that is in the past
-    will be deleted. Use dry_run=true to preview without deleting.
+    Memories whose `expires_at_ts` is in the past will be deleted.
+    Use dry_run=true to preview without deleting.
     """
     try:
-        collection = get_chroma_collection()
-        all_docs = collection.get(include=["metadatas"])
-
-        if not all_docs["ids"]:
-            return PruneResponse(
-                status="success",
-                pruned_count=0,
-                total_before=0,
-                total_after=0,
-                by_category={}
-            )
-
-        total_before = len(all_docs["ids"])
-        now = datetime.now()
-
-        # Find expired memories
-        expired_ids = []
-        expired_by_category = {}
-
-        for i, doc_id in enumerate(all_docs["ids"]):
-            meta = all_docs["metadatas"][i] if all_docs["metadatas"] else {}
-            expires_at = meta.get("expires_at")
-
-            if expires_at:
-                try:
-                    exp_date = datetime.fromisoformat(expires_at)
-                    if exp_date < now:
-                        expired_ids.append(doc_id)
-                        cat = meta.get("category", "general")
-                        expired_by_category[cat] = expired_by_category.get(cat, 0) + 1
-                except ValueError:
-                    pass  # Invalid date format, skip
-
-        # Delete expired memories (unless dry run)
-        if expired_ids and not dry_run:
-            collection.delete(ids=expired_ids)
-
-        total_after = total_before - len(expired_ids) if not dry_run else total_before
-
-        return PruneResponse(
-            status="dry_run" if dry_run else "success",
-            pruned_count=len(expired_ids),
-            total_before=total_before,
-            total_after=total_after,
-            by_category=expired_by_category
-        )
+        return await run_in_threadpool(prune_expired, dry_run)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -530,35 +804,34 @@ async def list_expired_memories(
     """List all currently expired memories (preview before pruning)."""
     try:
         collection = get_chroma_collection()
-        all_docs = collection.get(include=["documents", "metadatas"])
+        now_ts = int(time.time())
+        expired_docs = await run_in_threadpool(
+            collection.get,
+            where={"expires_at_ts": {"$lte": now_ts}},
+            limit=limit,
+            include=["metadatas"]
+        )
+        rows = list(zip(expired_docs["ids"], expired_docs["metadatas"], strict=True))
 
-        now = datetime.now()
-        expired = []
+        # Memory text normally lives in metadata.data; documents are only read
+        # for the selected rows that lack it
+        missing_ids = [doc_id for doc_id, meta in rows if not meta.get("data")]
+        documents = {}
+        if missing_ids:
+            missing_docs = await run_in_threadpool(collection.get, ids=missing_ids, include=["documents"])
+            documents = dict(zip(missing_docs["ids"], missing_docs["documents"], strict=True))
 
-        if all_docs["ids"]:
-            for i, doc_id in enumerate(all_docs["ids"]):
-                meta = all_docs["metadatas"][i] if all_docs["metadatas"] else {}
-                expires_at = meta.get("expires_at")
-
-                if expires_at:
-                    try:
-                        exp_date = datetime.fromisoformat(expires_at)
-                        if exp_date < now:
-                            days_expired = (now - exp_date).days
-                            doc = all_docs["documents"][i] if all_docs["documents"] else ""
-                            expired.append({
-                                "id": doc_id,
-                                "memory": doc[:100] + "..." if len(doc) > 100 else doc,
-                                "category": meta.get("category", "general"),
-                                "project": meta.get("project", "general"),
-                                "expired_at": expires_at,
-                                "days_expired": days_expired
-                            })
-                    except ValueError:
-                        pass
-
-                if len(expired) >= limit:
-                    break
+        expired = []
+        for doc_id, meta in rows:
+            doc = meta.get("data") or documents.get(doc_id) or ""
+            expired.append({
+                "id": doc_id,
+                "memory": doc[:100] + "..." if len(doc) > 100 else doc,
+                "category": meta.get("category", "general"),
+                "project": meta.get("project", "general"),
+                "expired_at": meta.get("expires_at"),
+                "days_expired": (now_ts - meta["expires_at_ts"]) // 86400
+            })
 
         return {
             "status": "success",
@@ -570,10 +843,12 @@ async def list_expired_memories(
 
 
 if __name__ == "__main__":
+    # uvicorn uses uvloop and httptools automatically when installed (uvicorn[standard])
     uvicorn.run(
         "server:app",
         host=SERVER_HOST,
         port=SERVER_PORT,
+        workers=SERVER_WORKERS,
         reload=False,
         log_level="info"
     )